@@ -1,12 +1,15 @@
 import PySimpleGUI as sg
-import tabula
 import pandas as pd
-import matplotlib.pyplot as plt
 from io import BytesIO
 import numpy as np
-from fpdf import FPDF
+from numba import njit
 import tempfile
 import os
+import sys
+import functools
+import hashlib
+import multiprocessing
+import threading
 
 sg.theme('LightGrey1')
 
@@ -14,13 +17,93 @@ FONT_TITLE = ('Helvetica', 16, 'bold')
 FONT_SUBTITLE = ('Helvetica', 12, 'bold')
 FONT_BODY = ('Helvetica', 10)
 
+# Spawned workers re-import this module (PySimpleGUI, pandas, numba), which
+# costs about a second, while a 20-row page extracts in about 30 ms. With four
+# workers that breaks even around 55 pages; 100 leaves some margin.
+PARALLEL_MIN_PAGES = 100
+PARALLEL_WORKERS = min(4, os.cpu_count() or 1)
+
+STAT_LABELS = {
+    '-MEAN-': 'Media',
+    '-MEDIAN-': 'Mediana',
+    '-MODE-': 'Moda',
+    '-RANGE-': 'Rango',
+    '-STD-': 'Desv. Estándar',
+    '-VAR-': 'Varianza',
+    '-CV-': 'Coef. Variación',
+    '-SIQR-': 'Semi-Intercuartil',
+    '-MAD-': 'Desv. Promedio'
+}
+
+class _HoraTable(dict):
+    # str.translate table mapping every character except digits and ':' to ':'
+    def __missing__(self, code):
+        self[code] = code if chr(code) in '0123456789:' else ord(':')
+        return self[code]
+
+_HORA_TABLE = _HoraTable()
+
+@functools.lru_cache(maxsize=1)
+def _quantile_func():
+    # numbagg takes ~200 ms to import, so it is looked up on first use
+    try:
+        import numbagg
+        return numbagg.nanquantile
+    except ImportError:
+        return np.nanquantile
+
+# The warm-up thread builds the shared figure while the GUI thread may already
+# be drawing into it, so creation and drawing both happen under this lock
+_FIGURE_LOCK = threading.Lock()
+
+@functools.lru_cache(maxsize=1)
+def _histogram_figure():
+    # matplotlib is imported on first use to keep it out of the startup path
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    
+    fig = Figure(figsize=(8, 4), dpi=150)
+    return fig, fig.add_subplot(), FigureCanvasAgg(fig)
+
 def process_pdf(file_path):
     try:
-        tables = tabula.read_pdf(file_path, pages='all', multiple_tables=True)
-        if not tables:
+        with open(file_path, 'rb') as f:
+            sha = hashlib.sha256(f.read()).hexdigest()
+    except OSError as e:
+        return None, str(e)
+
+    df, error = _process_pdf_cached(file_path, sha)
+    # Copy so calculate_statistics can add columns without touching the cached frame
+    return (df.copy() if df is not None else None), error
+
+def _extract_parallel(file_path, n_pages):
+    from pdf_pages import extract_pages
+    
+    # Spawn on every platform: it is what Windows uses anyway, and forking
+    # while the warm-up thread is alive is unsafe
+    ctx = multiprocessing.get_context('spawn')
+    step = -(-n_pages // PARALLEL_WORKERS)
+    ranges = [(file_path, start, min(start + step, n_pages)) for start in range(0, n_pages, step)]
+    with ctx.Pool(len(ranges)) as pool:
+        chunks = pool.map(extract_pages, ranges)
+    return [row for chunk in chunks for row in chunk]
+
+@functools.lru_cache(maxsize=8)
+def _process_pdf_cached(file_path, sha):
+    try:
+        import pdfplumber
+        
+        with pdfplumber.open(file_path) as pdf:
+            n_pages = len(pdf.pages)
+            parallel = n_pages >= PARALLEL_MIN_PAGES and PARALLEL_WORKERS > 1
+            if not parallel:
+                rows = [row for page in pdf.pages for row in (page.extract_table() or [])]
+        if parallel:
+            rows = _extract_parallel(file_path, n_pages)
+        if not rows:
             return None, "No tables found in PDF"
         
-        df = tables[0].copy()
+        df = pd.DataFrame(rows[1:], columns=rows[0])
         
         if len(df.columns) == 4:
             df.columns = ['Lectura', 'Hora', 'Voltaje', 'Ordenado_ascendente']
@@ -29,9 +112,9 @@ def process_pdf(file_path):
         else:
             return None, "Unexpected table structure"
         
-        df['Voltaje'] = pd.to_numeric(df['Voltaje'], errors='coerce')
+        df['Voltaje'] = pd.to_numeric(df['Voltaje'], errors='coerce', downcast='float')
         df = df.dropna(subset=['Voltaje'])
-        df['Hora'] = df['Hora'].astype(str).str.replace(r'[^0-9:]', ':', regex=True)
+        df['Hora'] = df['Hora'].astype(str).map(lambda h: h.translate(_HORA_TABLE))
         
         if df.empty:
             return None, "No valid voltage data found"
@@ -40,43 +123,122 @@ def process_pdf(file_path):
     except Exception as e:
         return None, str(e)
 
+@njit(cache=True, fastmath=True)
+def _reduce(v, ref):
+    # Sums are taken around ref to keep the variance well-conditioned
+    s = 0.0
+    ss = 0.0
+    mn = v[0]
+    mx = v[0]
+    for x in v:
+        d = x - ref
+        s += d
+        ss += d * d
+        if x < mn:
+            mn = x
+        if x > mx:
+            mx = x
+    return s, ss, mn, mx
+
 def calculate_statistics(df):
     real_voltage = 127.00
     stats = {}
     
-    df['Error Absoluto'] = abs(df['Voltaje'] - real_voltage)
-    df['Error Relativo (%)'] = (df['Error Absoluto'] / real_voltage) * 100
+    v = df['Voltaje'].to_numpy(dtype=np.float32, copy=False)
     
-    stats['mean'] = df['Voltaje'].mean()
-    stats['median'] = df['Voltaje'].median()
-    stats['mode'] = df['Voltaje'].mode().tolist()
-    stats['std_dev'] = df['Voltaje'].std()
-    stats['variance'] = df['Voltaje'].var()
-    stats['range'] = df['Voltaje'].max() - df['Voltaje'].min()
-    stats['coefficient_variation'] = stats['std_dev'] / stats['mean'] if stats['mean'] != 0 else 0
-    q1, q3 = df['Voltaje'].quantile([0.25, 0.75])
-    stats['semi_interquartil'] = (q3 - q1) / 2
-    stats['mad'] = (df['Voltaje'] - stats['mean']).abs().mean()
+    abs_err = v - real_voltage
+    np.abs(abs_err, out=abs_err)
+    df['Error Absoluto'] = abs_err
+    df['Error Relativo (%)'] = abs_err * (100.0 / real_voltage)
+    
+    n = len(v)
+    s, ss, vmin, vmax = _reduce(v, real_voltage)
+    mean = real_voltage + s / n
+    variance = max(ss - s * s / n, 0.0) / (n - 1) if n > 1 else np.nan
+    std = np.sqrt(variance)
+    dev = v - mean
+    np.abs(dev, out=dev)
+    # One call so both quartiles share a single sort; don't split it
+    q1, q3 = _quantile_func()(v, [0.25, 0.75])
+    vals, counts = np.unique(v, return_counts=True)
+    
+    stats['mean'] = float(mean)
+    stats['median'] = float(np.median(v))
+    # Kept as float32 scalars so they print with their short repr
+    stats['mode'] = list(vals[counts == counts.max()])
+    stats['std_dev'] = float(std)
+    stats['variance'] = float(variance)
+    stats['range'] = float(vmax - vmin)
+    stats['coefficient_variation'] = float(std / mean) if mean != 0 else 0
+    stats['semi_interquartil'] = float((q3 - q1) / 2)
+    stats['mad'] = float(dev.mean())
     
     return stats, df
 
-def create_histogram(data):
-    plt.figure(figsize=(8, 4))
-    plt.hist(data, bins=12, edgecolor='black', alpha=0.7, color='#1f77b4')
-    plt.title('Distribución de Lecturas de Voltaje')
-    plt.xlabel('Voltaje (V)')
-    plt.ylabel('Frecuencia')
-    plt.axvline(127, color='red', linestyle='dashed', linewidth=1, label='Valor Nominal')
-    plt.grid(True)
-    plt.legend()
+def create_histogram(data, fmt='ppm'):
+    key_bytes = np.asarray(data, dtype=np.float32).tobytes()
+    with _FIGURE_LOCK:
+        return _histogram_image(key_bytes, len(data), fmt)
+
+@functools.lru_cache(maxsize=4)
+def _histogram_image(key_bytes, n, fmt):
+    data = np.frombuffer(key_bytes, dtype=np.float32, count=n)
+    fig, ax, canvas = _histogram_figure()
+    counts, edges = np.histogram(data, bins=12)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    
+    ax.clear()
+    ax.bar(centers, counts, width=np.diff(edges), edgecolor='black', alpha=0.7, color='#1f77b4')
+    ax.set_title('Distribución de Lecturas de Voltaje')
+    ax.set_xlabel('Voltaje (V)')
+    ax.set_ylabel('Frecuencia')
+    ax.axvline(127, color='red', linestyle='dashed', linewidth=1, label='Valor Nominal')
+    ax.grid(True)
+    ax.legend()
     
-    buf = BytesIO()
-    plt.savefig(buf, format='png', dpi=150)
-    plt.close()
-    return buf.getvalue()
+    if fmt == 'png':
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=150)
+        return buf.getvalue()
+    
+    # Uncompressed PPM is enough for sg.Image and skips the zlib pass
+    canvas.draw()
+    w, h = canvas.get_width_height()
+    rgba = np.asarray(canvas.buffer_rgba())
+    header = f'P6\n{w} {h}\n255\n'.encode()
+    return header + rgba[..., :3].tobytes()
+
+def format_stats(stats):
+    texts = {
+        '-MEAN-': f"{stats['mean']:.4f} V",
+        '-MEDIAN-': f"{stats['median']:.4f} V",
+        '-MODE-': ', '.join(map(str, stats['mode'])) + ' V',
+        '-RANGE-': f"{stats['range']:.4f} V",
+        '-STD-': f"{stats['std_dev']:.4f} V",
+        '-VAR-': f"{stats['variance']:.4f} V²",
+        '-CV-': f"{stats['coefficient_variation']:.4f}",
+        '-SIQR-': f"{stats['semi_interquartil']:.4f} V",
+        '-MAD-': f"{stats['mad']:.4f} V"
+    }
+    return [(key, label, texts[key]) for key, label in STAT_LABELS.items()]
 
-def create_report(stats, histogram_path, output_path):
-    pass
+def create_report(stats, histogram_data, output_path):
+    from fpdf import FPDF
+    
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font('Helvetica', 'B', 16)
+    pdf.cell(0, 10, 'Reporte de Lecturas de Voltaje', new_x='LMARGIN', new_y='NEXT', align='C')
+    pdf.set_font('Helvetica', '', 10)
+    pdf.cell(0, 8, 'Valor Nominal: 127.00 V', new_x='LMARGIN', new_y='NEXT')
+    
+    for _, label, text in format_stats(stats):
+        pdf.cell(50, 6, label + ':')
+        pdf.cell(0, 6, text, new_x='LMARGIN', new_y='NEXT')
+    
+    pdf.ln(4)
+    pdf.image(BytesIO(histogram_data), w=pdf.epw)
+    pdf.output(output_path)
 
 def main_window():
     layout = [
@@ -96,8 +258,10 @@ def main_window():
     ]
     return sg.Window('Analizador de Voltaje', layout, element_justification='center')
 
-def results_window(stats, df, histogram_data):
-    data_table = df[['Hora', 'Voltaje', 'Error Absoluto', 'Error Relativo (%)']].values.tolist()
+def _stat_row(key):
+    return [sg.Text(STAT_LABELS[key] + ':', font=FONT_BODY), sg.Push(), sg.Text('', key=key, font=('Courier New', 10))]
+
+def results_window():
     headers_table = ['Hora', 'Voltaje (V)', 'Error Abs. (V)', 'Error Rel. (%)']
     
     stats_layout = [
@@ -105,21 +269,21 @@ def results_window(stats, df, histogram_data):
         [sg.Column([
             [
                 sg.Frame('Centralidad', [
-                    [sg.Text('Media:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['mean']:.4f} V", font=('Courier New', 10))],
-                    [sg.Text('Mediana:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['median']:.4f} V", font=('Courier New', 10))],
-                    [sg.Text('Moda:', font=FONT_BODY), sg.Push(), sg.Text(', '.join(map(str, stats['mode'])) + ' V', font=('Courier New', 10))]
+                    _stat_row('-MEAN-'),
+                    _stat_row('-MEDIAN-'),
+                    _stat_row('-MODE-')
                 ], border_width=0),
                 sg.Frame('Dispersión', [
-                    [sg.Text('Rango:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['range']:.4f} V", font=('Courier New', 10))],
-                    [sg.Text('Desv. Estándar:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['std_dev']:.4f} V", font=('Courier New', 10))],
-                    [sg.Text('Varianza:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['variance']:.4f} V²", font=('Courier New', 10))]
+                    _stat_row('-RANGE-'),
+                    _stat_row('-STD-'),
+                    _stat_row('-VAR-')
                 ], border_width=0)
             ],
             [
                 sg.Frame('Otros', [
-                    [sg.Text('Coef. Variación:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['coefficient_variation']:.4f}", font=('Courier New', 10))],
-                    [sg.Text('Semi-Intercuartil:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['semi_interquartil']:.4f} V", font=('Courier New', 10))],
-                    [sg.Text('Desv. Promedio:', font=FONT_BODY), sg.Push(), sg.Text(f"{stats['mad']:.4f} V", font=('Courier New', 10))]
+                    _stat_row('-CV-'),
+                    _stat_row('-SIQR-'),
+                    _stat_row('-MAD-')
                 ], border_width=0)
             ]
         ], element_justification='left')]
@@ -131,8 +295,9 @@ def results_window(stats, df, histogram_data):
                 sg.Tab('Datos', [
                     [sg.Text('Lecturas de Voltaje', font=FONT_SUBTITLE, pad=(0, 10))],
                     [sg.Table(
-                        values=data_table,
+                        values=[],
                         headings=headers_table,
+                        key='-TBL-',
                         auto_size_columns=False,
                         col_widths=[8, 10, 12, 12],
                         justification='right',
@@ -146,7 +311,7 @@ def results_window(stats, df, histogram_data):
                 ]),
                 sg.Tab('Gráfica', [
                     [sg.Text('Distribución de Voltajes', font=FONT_SUBTITLE, pad=(0, 10))],
-                    [sg.Image(data=histogram_data, key='-HIST-', expand_x=True)]
+                    [sg.Image(key='-HIST-', expand_x=True)]
                 ])
             ]
         ], font=FONT_BODY)
@@ -167,10 +332,37 @@ def results_window(stats, df, histogram_data):
         [sg.Text('Valor Nominal: 127.00 V', font=FONT_BODY, pad=(10, 0))]
     ]
 
-    return sg.Window('Resultados', layout, finalize=True, resizable=True)
+    # Transparent until hidden so the window doesn't flash on screen at startup
+    window = sg.Window('Resultados', layout, finalize=True, resizable=True, alpha_channel=0)
+    window.hide()
+    return window
+
+def show_results(window, stats, df, histogram_data):
+    v_fmt = np.char.mod('%.4f', df['Voltaje'].to_numpy()).tolist()
+    ea_fmt = np.char.mod('%.4f', df['Error Absoluto'].to_numpy()).tolist()
+    er_fmt = np.char.mod('%.4f', df['Error Relativo (%)'].to_numpy()).tolist()
+    data_table = list(map(list, zip(df['Hora'].tolist(), v_fmt, ea_fmt, er_fmt)))
+    
+    for key, _, text in format_stats(stats):
+        window[key].update(text)
+    window['-TBL-'].update(values=data_table)
+    window['-HIST-'].update(data=histogram_data)
+    window.un_hide()
+    window.reappear()
+
+def _warm_up():
+    import pdfplumber
+    
+    with _FIGURE_LOCK:
+        _histogram_figure()
+    _reduce(np.zeros(1, dtype=np.float32), 0.0)
 
 def main():
+    # Load the deferred imports and compile the stats kernel while the user picks a file
+    threading.Thread(target=_warm_up, daemon=True).start()
     window = main_window()
+    # Built hidden up front so "Procesar" only has to fill in values
+    results = results_window()
     current_window = window
 
     while True:
@@ -193,22 +385,27 @@ def main():
             stats, df = calculate_statistics(df)
             histogram_data = create_histogram(df['Voltaje'])
             
-            current_window.close()
-            current_window = results_window(stats, df, histogram_data)
+            current_window.hide()
+            show_results(results, stats, df, histogram_data)
+            current_window = results
             
-        if event == 'Generar Reporte PDF':
-            temp_dir = tempfile.gettempdir()
-            hist_path = os.path.join(temp_dir, 'histogram.png')
-            with open(hist_path, 'wb') as f:
-                f.write(histogram_data)
-                
-            report_path = os.path.join(temp_dir, 'reporte_voltaje.pdf')
-            create_report(stats, hist_path, report_path)
+        if event == 'Generar Reporte':
+            report_path = os.path.join(tempfile.gettempdir(), 'reporte_voltaje.pdf')
+            try:
+                create_report(stats, create_histogram(df['Voltaje'], fmt='png'), report_path)
+            except Exception as e:
+                sg.popup_error(f'Error generando reporte:\n{e}')
+                continue
             
             sg.popup(f'Reporte generado exitosamente:\n{report_path}')
-            os.startfile(report_path)
+            if sys.platform == 'win32':
+                try:
+                    os.startfile(report_path)
+                except OSError as e:
+                    sg.popup_error(f'No se pudo abrir el reporte:\n{e}')
 
-    current_window.close()
+    results.close()
+    window.close()
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,8 @@
+# Worker entry point for the page-extraction pool in main.py. It lives in its
+# own module so that unpickling it in a worker only needs pdfplumber.
+import pdfplumber
+
+def extract_pages(args):
+    file_path, start, stop = args
+    with pdfplumber.open(file_path) as pdf:
+        return [row for page in pdf.pages[start:stop] for row in (page.extract_table() or [])]